@@ -14,101 +14,105 @@ Exit codes:
 
 import sys
 import re
+from functools import partial
 from pathlib import Path
 from typing import List, Tuple
 import yaml
 
+from loaders import find_task_files, map_files, read_file
 
-# Patterns that indicate macOS-specific operations
-MACOS_INDICATORS = [
-    r'homebrew',
-    r'brew\s+',
-    r'launchd',
-    r'xcode-select',
-    r'softwareupdate',
-    r'\.app["\']?\s*$',
-    r'\.dmg["\']?\s*$',
-    r'\.pkg["\']?\s*$',
-    r'/Applications/',
-    r'com\.apple\.',
-    r'defaults\s+write',
-    r'darwin',
+
+# Printed before the check runs (also used by validate_all.py)
+HEADER = "Checking for unguarded macOS-specific tasks..."
+
+# Patterns that indicate macOS-specific operations (bytes: files are scanned
+# without decoding, and every pattern is plain ASCII). Plain substrings are
+# found with a case-insensitive substring search; only the rest need regex.
+MACOS_LITERALS = [
+    b'homebrew',
+    b'launchd',
+    b'xcode-select',
+    b'softwareupdate',
+    b'/Applications/',
+    b'com.apple.',
+    b'darwin',
+]
+MACOS_REGEXES = [
+    rb'brew\s+',
+    rb'\.app["\']?\s*$',
+    rb'\.dmg["\']?\s*$',
+    rb'\.pkg["\']?\s*$',
+    rb'defaults\s+write',
 ]
 
 # Guards that indicate Darwin check
 DARWIN_GUARDS = [
-    r'ansible_system.*==.*["\']Darwin["\']',
-    r'ansible_os_family.*==.*["\']Darwin["\']',
-    r'ansible_distribution.*==.*["\']MacOSX["\']',
+    rb'ansible_system.*==.*["\']Darwin["\']',
+    rb'ansible_os_family.*==.*["\']Darwin["\']',
+    rb'ansible_distribution.*==.*["\']MacOSX["\']',
 ]
 
+# Compiled once at import so each file is scanned in a single pass
+_MACOS_LITERALS_LOWER = [literal.lower() for literal in MACOS_LITERALS]
+_MACOS_PATTERNS = [re.compile(p, re.IGNORECASE) for p in MACOS_REGEXES]
+_MACOS_RE = re.compile(b"|".join(MACOS_REGEXES), re.IGNORECASE)
+_DARWIN_RE = re.compile(b"|".join(DARWIN_GUARDS), re.IGNORECASE)
+
+
+def has_macos_indicators(content: bytes, lowered: bytes) -> bool:
+    """Return True if content (lowered: content.lower()) has any indicator."""
+    return (
+        any(literal in lowered for literal in _MACOS_LITERALS_LOWER)
+        or _MACOS_RE.search(content) is not None
+    )
+
+
+def find_macos_indicators(content: bytes, lowered: bytes) -> List[bytes]:
+    """Return the literals, then the regexes, found in content."""
+    found = [
+        literal
+        for literal, literal_lower in zip(MACOS_LITERALS, _MACOS_LITERALS_LOWER)
+        if literal_lower in lowered
+    ]
+    found.extend(p.pattern for p in _MACOS_PATTERNS if p.search(content))
+    return found
+
 
-def check_file_for_guards(file_path: Path) -> List[str]:
+def check_file_for_guards(file_path: Path, repo_root: Path) -> List[str]:
     """Check a single YAML file for unguarded macOS tasks."""
     issues = []
     
+    # Exception: preflight.yml is allowed (it's macOS-only by design)
+    if "preflight" in file_path.name.lower():
+        return []
+    
     try:
-        with open(file_path, "r") as f:
-            content = f.read()
+        content = read_file(file_path)
     except Exception as e:
         return [f"Failed to read {file_path}: {e}"]
     
     # Quick check: if file has Darwin guards, assume it's handled
-    has_guards = any(
-        re.search(pattern, content, re.IGNORECASE)
-        for pattern in DARWIN_GUARDS
-    )
-    
-    # Check for macOS indicators
-    macos_indicators_found = []
-    for pattern in MACOS_INDICATORS:
-        if re.search(pattern, content, re.IGNORECASE):
-            macos_indicators_found.append(pattern)
+    if _DARWIN_RE.search(content):
+        return []
     
     # If we found macOS indicators but no guards, flag it
-    # Exception: preflight.yml is allowed (it's macOS-only by design)
-    if macos_indicators_found and not has_guards:
-        if "preflight" not in file_path.name.lower():
-            issues.append(
-                f"{file_path.relative_to(Path.cwd())}: "
-                f"Contains macOS-specific patterns but no Darwin guard: "
-                f"{', '.join(macos_indicators_found[:3])}"
-            )
+    lowered = content.lower()
+    if has_macos_indicators(content, lowered):
+        macos_indicators_found = find_macos_indicators(content, lowered)
+        issues.append(
+            f"{file_path.relative_to(repo_root)}: "
+            f"Contains macOS-specific patterns but no Darwin guard: "
+            f"{', '.join(p.decode() for p in macos_indicators_found[:3])}"
+        )
     
     return issues
 
 
-def main() -> int:
-    """Run all validation checks."""
-    repo_root = Path(__file__).parent.parent
-    
-    print("Checking for unguarded macOS-specific tasks...")
-    print()
-    
-    all_issues = []
-    
-    # Check playbooks
-    playbooks_dir = repo_root / "playbooks"
-    if playbooks_dir.exists():
-        for yaml_file in playbooks_dir.glob("*.yml"):
-            all_issues.extend(check_file_for_guards(yaml_file))
-    
-    # Check roles
-    roles_dir = repo_root / "roles"
-    if roles_dir.exists():
-        for role_dir in roles_dir.iterdir():
-            if not role_dir.is_dir():
-                continue
-            tasks_dir = role_dir / "tasks"
-            if tasks_dir.exists():
-                for yaml_file in tasks_dir.glob("*.yml"):
-                    all_issues.extend(check_file_for_guards(yaml_file))
-    
-    # Report results
+def report_issues(all_issues: List[str]) -> int:
+    """Print the results of the guard check and return the exit code."""
     if all_issues:
         print("⚠️  Potential unguarded macOS tasks found:\n")
-        for issue in all_issues:
-            print(f"  - {issue}")
+        sys.stdout.write("".join(f"  - {issue}\n" for issue in all_issues))
         print()
         print("Note: This is a heuristic check. Review each case to determine")
         print("if a Darwin guard is needed or if the detection is a false positive.")
@@ -120,5 +124,23 @@ def main() -> int:
         return 0
 
 
+def main() -> int:
+    """Run all validation checks."""
+    repo_root = Path(__file__).parent.parent
+    
+    print(HEADER)
+    print()
+    
+    all_issues = []
+    
+    # Check playbooks and role task files
+    yaml_files = find_task_files(repo_root)
+    
+    for issues in map_files(partial(check_file_for_guards, repo_root=repo_root), yaml_files):
+        all_issues.extend(issues)
+    
+    return report_issues(all_issues)
+
+
 if __name__ == "__main__":
     sys.exit(main())
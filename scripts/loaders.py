@@ -0,0 +1,195 @@
+"""
+Shared file discovery and loading for the validation scripts.
+
+Each file is read (and parsed) at most once per process, so checks that run
+back to back - as in validate_all.py - reuse the same bytes and document
+instead of going to disk and the YAML parser again.
+"""
+
+import functools
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, FrozenSet, List, Sequence, Tuple, TypeVar
+import yaml
+from yaml.composer import Composer, ComposerError
+from yaml.constructor import SafeConstructor
+from yaml.events import (
+    MappingEndEvent,
+    MappingStartEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from yaml.resolver import Resolver
+
+# Prefer the LibYAML-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+    from yaml.cyaml import CParser
+    
+    class _EventLoader(CParser, Composer, SafeConstructor, Resolver):
+        """LibYAML event stream with the Python composer, so nodes can be
+        composed one at a time instead of a whole document at once."""
+        
+        def __init__(self, stream: io.BytesIO) -> None:
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+except ImportError:
+    from yaml import SafeLoader
+    
+    _EventLoader = SafeLoader
+
+# Files handed to each worker in one batch when checking in parallel
+CHUNKSIZE = 8
+
+_T = TypeVar("_T")
+
+
+def _yml_files(directory: str) -> List[Path]:
+    """Return the *.yml files directly inside directory (empty if missing)."""
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(".yml") and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def find_task_files(repo_root: Path) -> List[Path]:
+    """Return playbooks and role task files to check."""
+    # Playbooks
+    yaml_files = _yml_files(os.path.join(repo_root, "playbooks"))
+    
+    # Role task files (os.scandir avoids a stat() per entry where possible)
+    try:
+        with os.scandir(os.path.join(repo_root, "roles")) as roles:
+            for role_entry in roles:
+                if not role_entry.is_dir():
+                    continue
+                yaml_files.extend(_yml_files(os.path.join(role_entry.path, "tasks")))
+    except FileNotFoundError:
+        pass
+    
+    return yaml_files
+
+
+def map_files(func: Callable[[Path], _T], paths: Sequence[Path]) -> List[_T]:
+    """Apply func to each path, keeping order.
+    
+    Files are independent, so large trees are checked in a process pool. Below
+    two chunks per worker batch, starting the workers (and re-importing yaml
+    in each under the macOS 'spawn' start method) costs more than the checks,
+    so small trees are checked serially.
+    """
+    if len(paths) < 2 * CHUNKSIZE:
+        return list(map(func, paths))
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(func, paths, chunksize=CHUNKSIZE))
+
+
+@functools.lru_cache(maxsize=None)
+def read_file(path: Path) -> bytes:
+    """Return the raw contents of a file."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _yaml_stream(path: Path) -> io.BytesIO:
+    """Wrap the cached contents of path so YAML error marks name the file."""
+    stream = io.BytesIO(read_file(path))
+    stream.name = str(path)
+    return stream
+
+
+@functools.lru_cache(maxsize=None)
+def load_yaml(path: Path) -> Tuple[bytes, Any]:
+    """Return the raw contents of a YAML file and its parsed document."""
+    return read_file(path), yaml.load(_yaml_stream(path), Loader=SafeLoader)
+
+
+def _skip_node(loader: Any) -> None:
+    """Consume the events of the next node without building it."""
+    depth = 0
+    while True:
+        event = loader.get_event()
+        if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def _load_filtered(loader: Any, keep_keys: FrozenSet[str]) -> Any:
+    """Walk a single-document event stream; see load_yaml_filtered."""
+    loader.get_event()  # StreamStart
+    if loader.check_event(StreamEndEvent):
+        return None
+    loader.get_event()  # DocumentStart
+    
+    if not loader.check_event(SequenceStartEvent):
+        data = loader.construct_document(loader.compose_node(None, None))
+    else:
+        loader.get_event()
+        data = []
+        while not loader.check_event(SequenceEndEvent):
+            if not loader.check_event(MappingStartEvent):
+                data.append(loader.construct_document(loader.compose_node(None, None)))
+                continue
+            
+            loader.get_event()
+            item = {}
+            while not loader.check_event(MappingEndEvent):
+                key = loader.construct_document(loader.compose_node(None, None))
+                if isinstance(key, str) and key in keep_keys:
+                    item[key] = loader.construct_document(loader.compose_node(None, None))
+                else:
+                    _skip_node(loader)
+                    if isinstance(key, str):
+                        item[key] = None
+            loader.get_event()
+            data.append(item)
+        loader.get_event()
+    
+    loader.get_event()  # DocumentEnd
+    if not loader.check_event(StreamEndEvent):
+        raise ComposerError(
+            "expected a single document in the stream", None,
+            "but found another document", loader.get_event().start_mark,
+        )
+    return data
+
+
+@functools.lru_cache(maxsize=None)
+def load_yaml_filtered(path: Path, keep_keys: FrozenSet[str]) -> Any:
+    """Parse a YAML file, building only the parts a task-level check reads.
+    
+    In a top-level list of mappings (plays or tasks), only the values of
+    keep_keys are constructed; other keys are skipped at the event level and
+    kept with a None value, so key presence checks still work. Anything else
+    is loaded as usual.
+    
+    Skipped sections are only checked for YAML syntax: anchors and aliases
+    inside them are not resolved, so e.g. an undefined alias under vars: is
+    not reported. That is acceptable for the task-level checks that use this
+    loader; yamllint and ansible-playbook --syntax-check load every file in
+    full and still report such errors.
+    """
+    loader = _EventLoader(_yaml_stream(path))
+    try:
+        return _load_filtered(loader, keep_keys)
+    except yaml.MarkedYAMLError:
+        # An alias pointing into a skipped section, a merge key (<<) that can
+        # only be resolved against its whole mapping, or an error in a kept
+        # section: fall back to a full parse, which either succeeds or raises
+        # the real error
+        return load_yaml(path)[1]
+    finally:
+        loader.dispose()
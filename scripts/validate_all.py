@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Run all custom validation scripts in one process.
+
+Runs the same checks as the individual scripts in scripts/, but reads each
+playbook and role task file once: the Darwin guard check and the idempotency
+check share the cached file contents from loaders.py.
+
+Exit codes:
+  0 - All checks passed
+  1 - One or more checks reported errors
+"""
+
+import sys
+from functools import partial
+from pathlib import Path
+from typing import List, Tuple
+
+import check_darwin_guards
+import validate_idempotency
+import validate_models
+import validate_structure
+from loaders import find_task_files, map_files
+
+
+def check_task_file(
+    file_path: Path, repo_root: Path
+) -> Tuple[List[str], List[validate_idempotency.Issue]]:
+    """Run the per-file checks on one file, reusing a single read."""
+    return (
+        check_darwin_guards.check_file_for_guards(file_path, repo_root),
+        validate_idempotency.check_yaml_file(file_path),
+    )
+
+
+def main() -> int:
+    """Run all validation checks."""
+    repo_root = Path(__file__).parent.parent
+    exit_code = 0
+    
+    print("→ Validating role structure...")
+    exit_code |= validate_structure.main()
+    print()
+    
+    print("→ Validating model declarations...")
+    exit_code |= validate_models.main()
+    print()
+    
+    guard_issues = []
+    idempotency_issues = []
+    
+    results = map_files(
+        partial(check_task_file, repo_root=repo_root), find_task_files(repo_root)
+    )
+    for guards, idempotency in results:
+        guard_issues.extend(guards)
+        idempotency_issues.extend(idempotency)
+    
+    print("→ Checking Darwin guards...")
+    print(check_darwin_guards.HEADER)
+    print()
+    exit_code |= check_darwin_guards.report_issues(guard_issues)
+    print()
+    
+    print("→ Checking idempotency patterns...")
+    print(validate_idempotency.HEADER)
+    print()
+    exit_code |= validate_idempotency.report_issues(idempotency_issues)
+    
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,36 +15,100 @@ Exit codes:
 import sys
 import re
 from pathlib import Path
-from typing import List, Dict, Any
-import yaml
+from typing import List, Dict, Any, NamedTuple
 
+from loaders import find_task_files, load_yaml_filtered, map_files, read_file
 
-def check_task_idempotency(task: Dict[str, Any], file_path: Path, task_idx: int) -> List[str]:
+
+# Printed before the check runs (also used by validate_all.py)
+HEADER = "Checking shell/command task idempotency patterns..."
+
+# Keys that only appear on plays, never on tasks
+PLAY_KEYS = frozenset({
+    "hosts",
+    "pre_tasks",
+    "tasks",
+    "post_tasks",
+    "import_playbook",
+    "ansible.builtin.import_playbook",
+    "ansible.legacy.import_playbook",
+})
+
+# Play sections that hold tasks, in execution order
+TASK_SECTIONS = ("pre_tasks", "tasks", "post_tasks")
+
+# Task keys for the modules this script checks, mapped to the module type
+MODULE_TYPES = {
+    "shell": "shell",
+    "ansible.builtin.shell": "shell",
+    "command": "command",
+    "ansible.builtin.command": "command",
+    "raw": "raw",
+    "ansible.builtin.raw": "raw",
+}
+
+# Substrings every MODULE_TYPES key contains, for a cheap check before parsing
+MODULE_KEYWORDS = (b"shell", b"command", b"raw")
+
+# Top-level keys whose values the checks below read; for plays and task files
+# alike, everything else (vars, handlers, roles, ...) is skipped while parsing
+CHECKED_KEYS = PLAY_KEYS.union(MODULE_TYPES, {"name", "changed_when", "args"})
+
+# Report message for each kind of issue
+ISSUE_MESSAGES = {
+    "missing-guard": (
+        "{file_name}: Task '{task_name}' uses '{detail}' "
+        "without changed_when, creates, or removes"
+    ),
+    "raw-without-changed-when": (
+        "{file_name}: Task '{task_name}' uses 'raw' without changed_when "
+        "(acceptable in preflight.yml only)"
+    ),
+    "changed-when-true": (
+        "{file_name}: Task '{task_name}' has 'changed_when: true' "
+        "(disables idempotency - should have explanatory comment)"
+    ),
+    "parse-error": "Failed to parse {file_name}: {detail}",
+}
+
+
+class Issue(NamedTuple):
+    """An idempotency issue; only formatted into a message when reported."""
+    
+    file_name: str
+    task_name: str
+    kind: str
+    detail: str = ""
+    
+    def __str__(self) -> str:
+        return ISSUE_MESSAGES[self.kind].format(**self._asdict())
+
+
+def check_task_idempotency(task: Dict[str, Any], file_path: Path, task_idx: int) -> List[Issue]:
     """Check a single task for idempotency issues."""
     issues = []
     
-    task_name = task.get("name", f"task #{task_idx}")
-    
-    # Check if task uses shell or command
-    uses_shell = "shell" in task or "ansible.builtin.shell" in task
-    uses_command = "command" in task or "ansible.builtin.command" in task
-    uses_raw = "raw" in task or "ansible.builtin.raw" in task
+    # Find the shell/command/raw module (if any) in one pass over the task keys
+    module_type = None
+    module_args = None
+    for key, value in task.items():
+        module_type = MODULE_TYPES.get(key)
+        if module_type is not None:
+            module_args = value
+            break
     
-    if not (uses_shell or uses_command or uses_raw):
+    if module_type is None:
         return []
     
+    task_name = task.get("name", f"task #{task_idx}")
+    
     # Check for idempotency guards
     has_changed_when = "changed_when" in task
     has_creates = False
     has_removes = False
     
     # Check args dict for creates/removes
-    if uses_shell or uses_command:
-        module_key = "shell" if uses_shell else "command"
-        if module_key not in task:
-            module_key = f"ansible.builtin.{module_key}"
-        
-        module_args = task.get(module_key, {})
+    if module_type != "raw":
         if isinstance(module_args, dict):
             has_creates = "creates" in module_args
             has_removes = "removes" in module_args
@@ -56,110 +120,74 @@ def check_task_idempotency(task: Dict[str, Any], file_path: Path, task_idx: int)
             has_removes = has_removes or "removes" in task_args
     
     # Raw tasks get special treatment (preflight.yml uses them intentionally)
-    if uses_raw:
+    if module_type == "raw":
         if "preflight" not in file_path.name.lower():
             # Only flag raw outside of preflight
             if not has_changed_when:
-                issues.append(
-                    f"{file_path.name}: Task '{task_name}' uses 'raw' without changed_when "
-                    "(acceptable in preflight.yml only)"
-                )
+                issues.append(Issue(file_path.name, task_name, "raw-without-changed-when"))
         return issues
     
     # If no idempotency guard, flag it
     if not (has_changed_when or has_creates or has_removes):
-        module_type = "shell" if uses_shell else "command"
-        issues.append(
-            f"{file_path.name}: Task '{task_name}' uses '{module_type}' "
-            "without changed_when, creates, or removes"
-        )
+        issues.append(Issue(file_path.name, task_name, "missing-guard", module_type))
     
     # Check for changed_when: true (idempotency disabled)
     if has_changed_when:
         changed_value = task.get("changed_when")
         if changed_value is True:
-            issues.append(
-                f"{file_path.name}: Task '{task_name}' has 'changed_when: true' "
-                "(disables idempotency - should have explanatory comment)"
-            )
+            issues.append(Issue(file_path.name, task_name, "changed-when-true"))
     
     return issues
 
 
-def check_yaml_file(file_path: Path) -> List[str]:
+def is_play(entry: Dict[str, Any]) -> bool:
+    """Tell a play (playbook entry) apart from a task (task file entry)."""
+    return not PLAY_KEYS.isdisjoint(entry)
+
+
+def check_yaml_file(file_path: Path) -> List[Issue]:
     """Check all tasks in a YAML file."""
     issues = []
     
     try:
-        with open(file_path, "r") as f:
-            data = yaml.safe_load(f)
+        # Files that never mention shell/command/raw have nothing to check,
+        # so skip parsing them altogether
+        content = read_file(file_path)
+        if not any(keyword in content for keyword in MODULE_KEYWORDS):
+            return []
+        
+        data = load_yaml_filtered(file_path, CHECKED_KEYS)
     except Exception as e:
-        return [f"Failed to parse {file_path}: {e}"]
+        return [Issue(str(file_path), "", "parse-error", str(e))]
     
-    if not data:
+    if not data or not isinstance(data, list):
         return []
     
-    # Handle playbook format (list of plays)
-    if isinstance(data, list):
-        for play in data:
-            if not isinstance(play, dict):
-                continue
-            
-            # Check pre_tasks
-            for idx, task in enumerate(play.get("pre_tasks", [])):
-                if isinstance(task, dict):
-                    issues.extend(check_task_idempotency(task, file_path, idx))
-            
-            # Check tasks
-            for idx, task in enumerate(play.get("tasks", [])):
-                if isinstance(task, dict):
-                    issues.extend(check_task_idempotency(task, file_path, idx))
-            
-            # Check post_tasks
-            for idx, task in enumerate(play.get("post_tasks", [])):
-                if isinstance(task, dict):
-                    issues.extend(check_task_idempotency(task, file_path, idx))
-    
-    # Handle task file format (list of tasks)
-    elif isinstance(data, list):
-        for idx, task in enumerate(data):
-            if isinstance(task, dict):
-                issues.extend(check_task_idempotency(task, file_path, idx))
+    # Playbooks are lists of plays, task files lists of tasks. Decide for each
+    # entry, since a playbook may start with an import_playbook entry
+    for entry_idx, entry in enumerate(data):
+        if not isinstance(entry, dict):
+            continue
+        
+        # Handle plays: check pre_tasks, tasks and post_tasks
+        if is_play(entry):
+            for section in TASK_SECTIONS:
+                for idx, task in enumerate(entry.get(section) or ()):
+                    if isinstance(task, dict):
+                        issues.extend(check_task_idempotency(task, file_path, idx))
+        
+        # Handle task file entries
+        else:
+            issues.extend(check_task_idempotency(entry, file_path, entry_idx))
     
     return issues
 
 
-def main() -> int:
-    """Run all validation checks."""
-    repo_root = Path(__file__).parent.parent
-    
-    print("Checking shell/command task idempotency patterns...")
-    print()
-    
-    all_issues = []
-    
-    # Check playbooks
-    playbooks_dir = repo_root / "playbooks"
-    if playbooks_dir.exists():
-        for yaml_file in playbooks_dir.glob("*.yml"):
-            all_issues.extend(check_yaml_file(yaml_file))
-    
-    # Check roles
-    roles_dir = repo_root / "roles"
-    if roles_dir.exists():
-        for role_dir in roles_dir.iterdir():
-            if not role_dir.is_dir():
-                continue
-            tasks_dir = role_dir / "tasks"
-            if tasks_dir.exists():
-                for yaml_file in tasks_dir.glob("*.yml"):
-                    all_issues.extend(check_yaml_file(yaml_file))
-    
-    # Report results
+def report_issues(all_issues: List[Issue]) -> int:
+    """Print the results of the idempotency check and return the exit code."""
     if all_issues:
         print("⚠️  Idempotency issues found:\n")
-        for issue in all_issues:
-            print(f"  - {issue}")
+        sys.stdout.write("".join(f"  - {issue}\n" for issue in all_issues))
         print()
         print("Note: These are recommendations. Tasks may be intentionally")
         print("non-idempotent if properly documented. Review each case.")
@@ -171,5 +199,23 @@ def main() -> int:
         return 0
 
 
+def main() -> int:
+    """Run all validation checks."""
+    repo_root = Path(__file__).parent.parent
+    
+    print(HEADER)
+    print()
+    
+    all_issues = []
+    
+    # Check playbooks and role task files
+    yaml_files = find_task_files(repo_root)
+    
+    for issues in map_files(check_yaml_file, yaml_files):
+        all_issues.extend(issues)
+    
+    return report_issues(all_issues)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -19,6 +19,12 @@ from pathlib import Path
 from typing import Any, Dict, List
 import yaml
 
+from loaders import load_yaml
+
+
+# Allowed values for a model's optional 'state' field
+VALID_STATES = frozenset({"present", "absent"})
+
 
 def validate_model_structure(models: Any) -> List[str]:
     """Validate model list structure."""
@@ -32,6 +38,7 @@ def validate_model_structure(models: Any) -> List[str]:
         return []
     
     seen_names = set()
+    duplicate_names = set()
     
     for idx, model in enumerate(models):
         if not isinstance(model, dict):
@@ -53,10 +60,12 @@ def validate_model_structure(models: Any) -> List[str]:
             errors.append(f"Model at index {idx}: 'name' cannot be empty")
             continue
         
-        # Check for duplicates
-        if name in seen_names:
+        # Check for duplicates (each duplicated name is reported once)
+        if name not in seen_names:
+            seen_names.add(name)
+        elif name not in duplicate_names:
+            duplicate_names.add(name)
             errors.append(f"Duplicate model name: '{name}'")
-        seen_names.add(name)
         
         # Encourage fully qualified names (warn if looks like implicit :latest)
         # This is a soft check - some models don't use tags
@@ -68,7 +77,7 @@ def validate_model_structure(models: Any) -> List[str]:
         # Check optional 'state' field
         if "state" in model:
             state = model["state"]
-            if state not in ["present", "absent"]:
+            if not isinstance(state, str) or state not in VALID_STATES:
                 errors.append(
                     f"Model '{name}': 'state' must be 'present' or 'absent', got '{state}'"
                 )
@@ -90,8 +99,7 @@ def main() -> int:
     
     # Load variables file
     try:
-        with open(vars_file, "r") as f:
-            vars_data = yaml.safe_load(f)
+        _, vars_data = load_yaml(vars_file)
     except yaml.YAMLError as e:
         print(f"❌ Failed to parse YAML: {e}")
         return 1
@@ -109,8 +117,7 @@ def main() -> int:
     # Report results
     if errors:
         print("❌ Model validation errors found:\n")
-        for error in errors:
-            print(f"  - {error}")
+        sys.stdout.write("".join(f"  - {error}\n" for error in errors))
         print()
         return 1
     else:
@@ -13,6 +13,7 @@ Exit codes:
   1 - Validation errors found
 """
 
+import os
 import sys
 from pathlib import Path
 from typing import List, Tuple
@@ -69,26 +70,31 @@ def validate_task_files(roles_dir: Path) -> List[str]:
             continue
         
         tasks_dir = role_dir / "tasks"
-        if not tasks_dir.exists():
+        if not tasks_dir.is_dir():
             continue
         
         role_name = role_dir.name
         
-        # Find all YAML files in tasks/
-        task_files = list(tasks_dir.glob("*.yml")) + list(tasks_dir.glob("*.yaml"))
+        # Find all YAML files in tasks/ (one directory scan for both extensions)
+        yml_names = []
+        yaml_names = []
+        with os.scandir(tasks_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".yml"):
+                    yml_names.append(entry.name)
+                elif entry.name.endswith(".yaml"):
+                    yaml_names.append(entry.name)
+        task_files = yml_names + yaml_names
         
         # Check for consistent naming (all .yml or all .yaml, not mixed)
-        yml_count = len(list(tasks_dir.glob("*.yml")))
-        yaml_count = len(list(tasks_dir.glob("*.yaml")))
-        
-        if yml_count > 0 and yaml_count > 0:
+        if yml_names and yaml_names:
             errors.append(
                 f"Role '{role_name}' mixes .yml and .yaml extensions in tasks/"
             )
         
         # Warn if tasks have unclear names
         for task_file in task_files:
-            name = task_file.stem
+            name = os.path.splitext(task_file)[0]
             if name not in ["main"] and not any(
                 keyword in name.lower()
                 for keyword in ["install", "configure", "setup", "verify", "preflight", "models", "assert"]
@@ -116,8 +122,7 @@ def main() -> int:
     # Report results
     if all_errors:
         print("❌ Validation errors found:\n")
-        for error in all_errors:
-            print(f"  - {error}")
+        sys.stdout.write("".join(f"  - {error}\n" for error in all_errors))
         print()
         return 1
     else:
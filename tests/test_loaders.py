@@ -0,0 +1,60 @@
+"""
+Regression tests for the filtered YAML loader in scripts/loaders.py.
+
+Run with: python3 -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from loaders import load_yaml_filtered  # noqa: E402
+from validate_idempotency import CHECKED_KEYS, check_yaml_file  # noqa: E402
+
+
+class LoadYamlFilteredTest(unittest.TestCase):
+    """Cases that take the fallback to a full parse."""
+    
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+    
+    def write(self, content: str) -> Path:
+        path = Path(self.tmp.name) / "tasks.yml"
+        path.write_text(content)
+        return path
+    
+    def test_merge_key_in_task(self) -> None:
+        path = self.write(
+            "- name: a\n"
+            "  shell: echo\n"
+            "  <<: {changed_when: false}\n"
+            "- name: b\n"
+            "  command: echo\n"
+        )
+        data = load_yaml_filtered(path, CHECKED_KEYS)
+        self.assertEqual(data[0]["changed_when"], False)
+        issues = check_yaml_file(path)
+        self.assertEqual([(i.task_name, i.kind) for i in issues], [("b", "missing-guard")])
+    
+    def test_alias_into_skipped_section(self) -> None:
+        path = self.write(
+            "- hosts: all\n"
+            "  vars:\n"
+            "    guard: &guard false\n"
+            "  tasks:\n"
+            "    - name: a\n"
+            "      shell: echo\n"
+            "      changed_when: *guard\n"
+        )
+        data = load_yaml_filtered(path, CHECKED_KEYS)
+        self.assertEqual(data[0]["vars"], {"guard": False})
+        self.assertEqual(data[0]["tasks"][0]["changed_when"], False)
+        self.assertEqual(check_yaml_file(path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
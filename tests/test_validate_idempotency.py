@@ -0,0 +1,53 @@
+"""
+Regression tests for scripts/validate_idempotency.py.
+
+Run with: python3 -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from validate_idempotency import check_yaml_file  # noqa: E402
+
+
+class CheckYamlFileTest(unittest.TestCase):
+    """Playbook and task file detection."""
+    
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+    
+    def check(self, content: str) -> list:
+        path = Path(self.tmp.name) / "site.yml"
+        path.write_text(content)
+        return [(i.task_name, i.kind) for i in check_yaml_file(path)]
+    
+    def test_playbook_starting_with_import_playbook(self) -> None:
+        for key in ("import_playbook", "ansible.builtin.import_playbook"):
+            with self.subTest(key=key):
+                issues = self.check(
+                    f"- {key}: preflight.yml\n"
+                    "- hosts: all\n"
+                    "  tasks:\n"
+                    "    - name: t\n"
+                    "      shell: echo\n"
+                )
+                self.assertEqual(issues, [("t", "missing-guard")])
+    
+    def test_task_file(self) -> None:
+        issues = self.check(
+            "- name: a\n"
+            "  command: echo\n"
+            "  changed_when: false\n"
+            "- name: b\n"
+            "  command: echo\n"
+        )
+        self.assertEqual(issues, [("b", "missing-guard")])
+
+
+if __name__ == "__main__":
+    unittest.main()